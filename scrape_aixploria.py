@@ -11,9 +11,9 @@ SITEMAP_INDEX_URL = "https://www.aixploria.com/en/sitemap.xml"
 OUTPUT_FILE = "scraped_tools.json"
 MAX_TOOLS_TO_SCRAPE = 30  # Limit for testing, increase later
 
-def get_xml_content(url):
+def get_xml_content(url, session=requests):
     try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+        response = session.get(url, headers={'User-Agent': 'Mozilla/5.0'})
         if response.status_code == 200:
             return response.content
         else:
@@ -41,10 +41,10 @@ def parse_sitemap_urls(xml_content):
         urls.append(loc)
     return urls
 
-def scrape_tool_page(url):
+def scrape_tool_page(url, session=requests):
     try:
         print(f"Scraping: {url}")
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+        response = session.get(url, headers={'User-Agent': 'Mozilla/5.0'})
         if response.status_code != 200:
             print(f"Failed to load page: {response.status_code}")
             return None
@@ -133,7 +133,7 @@ def scrape_tool_page(url):
             try:
                 # Resolve the redirect to get the actual URL
                 # Use a session to keep cookies or headers if needed
-                head_resp = requests.head(external_link, headers={'User-Agent': 'Mozilla/5.0'}, allow_redirects=True, timeout=5)
+                head_resp = session.head(external_link, headers={'User-Agent': 'Mozilla/5.0'}, allow_redirects=True, timeout=5)
                 if head_resp.status_code == 200:
                     external_link = head_resp.url
             except:
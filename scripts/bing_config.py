@@ -9,3 +9,15 @@ SITEMAP_URL = "https://allaitoollist.com/sitemap.xml"
 BATCH_SIZE = 10  # Number of URLs to process in each batch
 DELAY_BETWEEN_URLS = 0.5  # Seconds to wait between each URL submission
 DELAY_BETWEEN_BATCHES = 2  # Seconds to wait between batches
+
+# Sharded sitemap settings (see sitemap_builder.py)
+SITEMAP_INDEX_URL = "https://allaitoollist.com/sitemaps/sitemap-index.xml"
+SITEMAP_DIR = "public/sitemaps"  # Served by Next.js as /sitemaps/*
+
+# Index status audit settings (bing_indexing.py --audit)
+AUDIT_WORKERS = 8  # Concurrent GetUrlInfo requests
+AUDIT_REQUESTS_PER_SECOND = 5  # Shared rate limit across all workers
+AUDIT_QUOTA = 10000  # Max GetUrlInfo calls per run
+AUDIT_CACHE_FILE = "index_status_cache.json"
+AUDIT_CACHE_TTL_HOURS = 72  # Re-check a URL after this long
+AUDIT_STALE_DAYS = 30  # Indexed URLs not crawled for this long are re-submitted
@@ -3,24 +3,58 @@ Bing Webmaster API - URL Indexing Script
 Automatically submit URLs from allaitoollist.com for indexing
 """
 
-import requests
+import re
+import gzip
 import json
 import time
-from datetime import datetime
+import argparse
+import threading
+import requests
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import xml.etree.ElementTree as ET
 from bing_config import API_KEY, SITE_URL, SITEMAP_URL, BATCH_SIZE, DELAY_BETWEEN_URLS, DELAY_BETWEEN_BATCHES
+from bing_config import (AUDIT_WORKERS, AUDIT_REQUESTS_PER_SECOND, AUDIT_QUOTA, AUDIT_CACHE_FILE,
+                         AUDIT_CACHE_TTL_HOURS, AUDIT_STALE_DAYS)
+
+# Bing Webmaster API endpoints (JSON flavour of the API)
+BASE_URL = "https://ssl.bing.com/webmaster/api.svc/json"
 
-# Bing Webmaster API endpoints
-BASE_URL = "https://ssl.bing.com/webmaster/api.svc"
+# Bing ErrorCode values returned in the JSON body of failed calls
+ERROR_NOT_FOUND = 11  # URL unknown to Bing - genuinely not indexed
+AUTH_ERROR_CODES = {3, 6, 14}  # InvalidApiKey, UserBlocked, NotAuthorized
+THROTTLE_ERROR_CODES = {4, 5}  # ThrottleUser, ThrottleHost (also sent once the daily quota is spent)
+
+class AuditAborted(Exception):
+    """Raised when Bing rejects the API key, so no result of the run can be trusted"""
+
+def parse_error_code(response):
+    """Bing's ErrorCode from a failed response body, or None if it has none"""
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict) and isinstance(body.get("d"), dict):
+        # Some endpoints wrap the fault in "d" like successful responses
+        body = body["d"]
+    return body.get("ErrorCode") if isinstance(body, dict) else None
+
+def is_auth_error(result):
+    """True if a failed call means the API key itself was rejected"""
+    return result.get("status_code") in (401, 403) or result.get("error_code") in AUTH_ERROR_CODES
 
 class BingWebmasterAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, session=None):
         self.api_key = api_key
         self.base_url = BASE_URL
+        # One pooled session, safe to share between audit worker threads
+        self.session = session or requests.Session()
         
-    def _make_request(self, endpoint, method="POST", data=None):
+    def _make_request(self, endpoint, method="POST", data=None, params=None):
         """Make API request to Bing Webmaster"""
-        url = f"{self.base_url}/{endpoint}?apikey={self.api_key}"
+        url = f"{self.base_url}/{endpoint}"
+        query = {"apikey": self.api_key}
+        query.update(params or {})
         
         headers = {
             'Content-Type': 'application/json; charset=utf-8'
@@ -28,14 +62,19 @@ class BingWebmasterAPI:
         
         try:
             if method == "POST":
-                response = requests.post(url, json=data, headers=headers)
+                response = self.session.post(url, params=query, json=data, headers=headers, timeout=30)
             else:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, params=query, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json() if response.text else None}
             else:
-                return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}",
+                    "status_code": response.status_code,
+                    "error_code": parse_error_code(response)
+                }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -57,40 +96,278 @@ class BingWebmasterAPI:
     
     def get_crawl_stats(self, site_url):
         """Get crawl statistics"""
-        data = {"siteUrl": site_url}
-        return self._make_request("GetCrawlStats", data=data)
+        params = {"siteUrl": site_url}
+        return self._make_request("GetCrawlStats", method="GET", params=params)
     
     def get_url_info(self, site_url, url):
         """Get information about a specific URL"""
-        data = {
+        params = {
             "siteUrl": site_url,
             "url": url
         }
-        return self._make_request("GetUrlInfo", data=data)
+        return self._make_request("GetUrlInfo", method="GET", params=params)
+
+class RateLimiter:
+    """Thread-safe request spacing with a hard per-run quota"""
 
-def fetch_sitemap_urls(sitemap_url):
-    """Fetch all URLs from sitemap.xml"""
+    def __init__(self, requests_per_second, quota):
+        self.interval = 1.0 / requests_per_second
+        self.remaining = quota
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for the next request slot; False once the quota is spent"""
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            slot = max(self.next_slot, time.monotonic())
+            self.next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - time.monotonic()))
+        return True
+
+    def backoff(self, seconds):
+        """Push every worker back after the API signals throttling"""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+    def stop(self):
+        """Spend the rest of the quota so every worker stops at its next acquire()"""
+        with self.lock:
+            self.remaining = 0
+
+def fetch_sitemap_entries(sitemap_url):
+    """Fetch (url, lastmod) pairs, following sitemap indexes and gzipped shards"""
+    namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
     try:
-        response = requests.get(sitemap_url)
+        response = requests.get(sitemap_url, timeout=30)
         if response.status_code != 200:
-            print(f"❌ Failed to fetch sitemap: HTTP {response.status_code}")
+            print(f"❌ Failed to fetch sitemap {sitemap_url}: HTTP {response.status_code}")
             return []
-        
-        # Parse XML
-        root = ET.fromstring(response.content)
-        
-        # Handle namespace
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        
-        urls = []
-        for url in root.findall('.//ns:url/ns:loc', namespace):
-            urls.append(url.text)
-        
-        return urls
+
+        content = response.content
+        if content[:2] == b"\x1f\x8b":
+            content = gzip.decompress(content)
+        root = ET.fromstring(content)
     except Exception as e:
-        print(f"❌ Error fetching sitemap: {e}")
+        print(f"❌ Error fetching sitemap {sitemap_url}: {e}")
         return []
 
+    entries = []
+    if root.tag.endswith("sitemapindex"):
+        for loc in root.findall('ns:sitemap/ns:loc', namespace):
+            entries.extend(fetch_sitemap_entries(loc.text.strip()))
+        return entries
+
+    for url in root.findall('ns:url', namespace):
+        loc = url.find('ns:loc', namespace)
+        lastmod = url.find('ns:lastmod', namespace)
+        if loc is not None and loc.text:
+            entries.append((loc.text.strip(), lastmod.text.strip() if lastmod is not None and lastmod.text else None))
+    return entries
+
+def parse_bing_date(value):
+    """Parse Bing's "/Date(1399100400000-0700)/" format into an aware datetime"""
+    match = re.search(r"/Date\((-?\d+)", value or "")
+    if not match:
+        return None
+    parsed = datetime.fromtimestamp(int(match.group(1)) / 1000, tz=timezone.utc)
+    # Bing reports "never" as the .NET minimum date
+    return parsed if parsed.year > 1970 else None
+
+def parse_lastmod(value):
+    """Parse a sitemap <lastmod> into an aware datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def load_status_cache(path=AUDIT_CACHE_FILE):
+    """Load cached GetUrlInfo results"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_status_cache(cache, path=AUDIT_CACHE_FILE):
+    """Persist GetUrlInfo results"""
+    with open(path, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+def is_cache_fresh(entry, now, ttl_hours=AUDIT_CACHE_TTL_HOURS):
+    """True if a cached status is younger than the TTL"""
+    checked_at = parse_lastmod(entry.get("checked_at")) if entry else None
+    return bool(checked_at and now - checked_at < timedelta(hours=ttl_hours))
+
+def classify_status(entry, lastmod, now, stale_days=AUDIT_STALE_DAYS):
+    """Return "indexed", "unindexed" or "stale" for a cached status entry"""
+    if not entry.get("indexed"):
+        return "unindexed"
+    last_crawled = parse_lastmod(entry.get("last_crawled"))
+    if not last_crawled or now - last_crawled > timedelta(days=stale_days):
+        return "stale"
+    # Page changed after Bing last crawled it
+    page_lastmod = parse_lastmod(lastmod)
+    if page_lastmod and page_lastmod > last_crawled:
+        return "stale"
+    return "indexed"
+
+def check_url_status(api, limiter, site_url, url, retries=3):
+    """Call GetUrlInfo for one URL under the shared limiter; None if it stays unchecked"""
+    for attempt in range(retries):
+        if not limiter.acquire():
+            return None
+
+        result = api.get_url_info(site_url, url)
+        if result["success"]:
+            info = (result.get("data") or {}).get("d") or {}
+            last_crawled = parse_bing_date(info.get("LastCrawledDate"))
+            return {
+                "indexed": bool(last_crawled) and info.get("HttpStatus", 200) == 200,
+                "last_crawled": last_crawled.isoformat() if last_crawled else None,
+                "http_status": info.get("HttpStatus"),
+                "checked_at": datetime.now(timezone.utc).isoformat()
+            }
+
+        if is_auth_error(result):
+            raise AuditAborted(result.get("error"))
+
+        status_code = result.get("status_code")
+        error_code = result.get("error_code")
+        if (status_code is None or status_code == 429 or status_code >= 500
+                or error_code in THROTTLE_ERROR_CODES):
+            # Timeouts, connection errors, throttling and quota say nothing about the URL - retry
+            limiter.backoff(2 ** attempt * 5)
+            continue
+
+        if error_code == ERROR_NOT_FOUND:
+            # Bing answers unknown URLs with NotFound rather than an empty record
+            return {
+                "indexed": False,
+                "last_crawled": None,
+                "error": result.get("error"),
+                "checked_at": datetime.now(timezone.utc).isoformat()
+            }
+
+        # Any other rejection (bad parameter, unexpected state, ...) leaves the URL unchecked
+        return None
+    return None
+
+def audit_index_status(api_key, site_url, entries, cache):
+    """Check every sitemap URL concurrently, reusing cached results within the TTL"""
+    api = BingWebmasterAPI(api_key)
+    limiter = RateLimiter(AUDIT_REQUESTS_PER_SECOND, AUDIT_QUOTA)
+    now = datetime.now(timezone.utc)
+
+    pending = [url for url, _ in entries if not is_cache_fresh(cache.get(url), now)]
+    print(f"📊 {len(entries)} URLs, {len(entries) - len(pending)} cached, {len(pending)} to check")
+
+    checked = 0
+    aborted = None
+    with ThreadPoolExecutor(max_workers=AUDIT_WORKERS) as executor:
+        futures = {executor.submit(check_url_status, api, limiter, site_url, url): url for url in pending}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            try:
+                status = future.result()
+            except AuditAborted as e:
+                # Stop every worker; results already collected are still valid
+                if aborted is None:
+                    aborted = e
+                    limiter.stop()
+                    for other in futures:
+                        other.cancel()
+                continue
+            if status is None:
+                continue
+            cache[futures[future]] = status
+            checked += 1
+            if checked % 100 == 0:
+                print(f"   ... {checked}/{len(pending)} checked")
+
+    if aborted is not None:
+        raise aborted
+
+    if checked < len(pending):
+        print(f"⚠️  {len(pending) - checked} URLs left unchecked (quota reached or API errors) for the next run")
+
+    report = {"indexed": [], "unindexed": [], "stale": [], "unchecked": []}
+    for url, lastmod in entries:
+        entry = cache.get(url)
+        if not entry:
+            report["unchecked"].append(url)
+        else:
+            report[classify_status(entry, lastmod, now)].append(url)
+    return report
+
+def urls_needing_submission(urls, cache, lastmods=None):
+    """Drop URLs the status cache already reports as freshly indexed"""
+    now = datetime.now(timezone.utc)
+    lastmods = lastmods or {}
+    return [
+        url for url in urls
+        if not (cache.get(url) and classify_status(cache[url], lastmods.get(url), now) == "indexed")
+    ]
+
+def run_audit():
+    """Status-audit mode: report unindexed/stale URLs and queue them for submission"""
+    print("🔍 Fetching URLs from sitemap...")
+    entries = fetch_sitemap_entries(SITEMAP_URL)
+    if not entries:
+        print("❌ No URLs found in sitemap.")
+        return
+
+    api = BingWebmasterAPI(API_KEY)
+    stats = api.get_crawl_stats(SITE_URL)
+    if not stats["success"] and is_auth_error(stats):
+        print(f"❌ Bing rejected the API key, audit not started: {stats.get('error')}")
+        return
+    if stats["success"]:
+        days = (stats.get("data") or {}).get("d") or []
+        if days:
+            latest = days[-1]
+            print(f"📈 Bing reports {latest.get('InIndex', '?')} pages in index, "
+                  f"{latest.get('CrawlErrors', 0)} crawl errors (sitemap has {len(entries)} URLs)")
+    else:
+        print(f"⚠️  Could not fetch crawl stats: {stats.get('error', 'Unknown error')}")
+
+    cache = load_status_cache()
+    try:
+        report = audit_index_status(API_KEY, SITE_URL, entries, cache)
+    except AuditAborted as e:
+        print(f"❌ Bing rejected the API key, audit stopped: {e}")
+        print("   Check API_KEY in bing_config.py; no URLs were marked unindexed.")
+        return
+    finally:
+        save_status_cache(cache)
+
+    print(f"\n{'='*60}")
+    print(f"📊 INDEX STATUS AUDIT")
+    print(f"{'='*60}")
+    for status in ["indexed", "stale", "unindexed", "unchecked"]:
+        print(f"{status.capitalize():<10}: {len(report[status])}")
+    print(f"{'='*60}\n")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_file = f"index_audit_{timestamp}.json"
+    with open(results_file, 'w') as f:
+        json.dump({
+            "timestamp": timestamp,
+            "site_url": SITE_URL,
+            "summary": {status: len(urls) for status, urls in report.items()},
+            "submission_queue": report["unindexed"] + report["stale"],
+            "report": report
+        }, f, indent=2)
+
+    print(f"💾 Audit saved to: {results_file}")
+    print("   Run without --audit to submit only the unindexed/stale URLs.")
+
 def submit_urls_for_indexing(api_key, site_url, urls):
     """Submit URLs for indexing with rate limiting"""
     api = BingWebmasterAPI(api_key)
@@ -149,6 +426,11 @@ def submit_urls_for_indexing(api_key, site_url, urls):
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Submit allaitoollist.com URLs to Bing")
+    parser.add_argument("--audit", action="store_true",
+                        help="Check index status of all sitemap URLs instead of submitting")
+    args = parser.parse_args()
+
     print(f"""
 ╔══════════════════════════════════════════════════════════╗
 ║     BING WEBMASTER API - URL INDEXING TOOL              ║
@@ -162,9 +444,16 @@ def main():
         print("   Edit the API_KEY variable at the top of this file.\n")
         return
     
+    if args.audit:
+        run_audit()
+        return
+    
     # Fetch URLs from sitemap
     print("🔍 Fetching URLs from sitemap...")
-    urls = fetch_sitemap_urls(SITEMAP_URL)
+    # Entries carry <lastmod>, so pages edited since Bing's last crawl count as stale
+    entries = fetch_sitemap_entries(SITEMAP_URL)
+    lastmods = dict(entries)
+    urls = [url for url, _ in entries]
     
     if not urls:
         print("❌ No URLs found in sitemap. Using default URLs...")
@@ -176,6 +465,15 @@ def main():
         ]
     else:
         print(f"✅ Found {len(urls)} URLs in sitemap\n")
+        
+        # Skip URLs a previous --audit run found freshly indexed
+        cache = load_status_cache()
+        if cache:
+            urls = urls_needing_submission(urls, cache, lastmods)
+            print(f"📋 {len(urls)} URLs still need submission after the last index audit")
+            if not urls:
+                print("✅ Everything is indexed - nothing to submit.")
+                return
     
     # Display URLs to be submitted
     print("\n📋 URLs to be submitted:")
@@ -1,17 +1,19 @@
 """
 Bing Webmaster API - Sitemap Submission Script
-Submit sitemap directly to Bing for indexing all URLs at once
+Submit the sitemap index (plus any shards the last build changed) to Bing
 """
 
 import requests
 import json
 from datetime import datetime
-from bing_config import API_KEY, SITE_URL, SITEMAP_URL
+from bing_config import API_KEY, SITE_URL, SITEMAP_INDEX_URL
+from sitemap_builder import changed_shard_urls
 
 class BingWebmasterAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, session=None):
         self.api_key = api_key
         self.base_url = "https://ssl.bing.com/webmaster/api.svc/json"
+        self.session = session or requests
         
     def submit_sitemap(self, site_url, sitemap_url):
         """Submit sitemap to Bing"""
@@ -27,7 +29,7 @@ class BingWebmasterAPI:
         }
         
         try:
-            response = requests.post(endpoint, params=params, json=data)
+            response = self.session.post(endpoint, params=params, json=data)
             
             if response.status_code == 200:
                 return {"success": True, "message": "Sitemap submitted successfully"}
@@ -46,7 +48,7 @@ class BingWebmasterAPI:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
+            response = self.session.get(endpoint, params=params)
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
@@ -69,7 +71,7 @@ class BingWebmasterAPI:
         }
         
         try:
-            response = requests.post(endpoint, params=params, json=data)
+            response = self.session.post(endpoint, params=params, json=data)
             
             if response.status_code == 200:
                 return {"success": True, "message": "URL submitted successfully"}
@@ -78,6 +80,17 @@ class BingWebmasterAPI:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+def submit_sitemap_index(api, site_url=SITE_URL):
+    """Submit SITEMAP_INDEX_URL, then each shard rewritten by the last sitemap_builder run
+
+    Returns {feed_url: result}. Resubmitting the changed shards tells Bing which parts
+    of the index to re-crawl first.
+    """
+    results = {}
+    for feed_url in [SITEMAP_INDEX_URL] + changed_shard_urls():
+        results[feed_url] = api.submit_sitemap(site_url, feed_url)
+    return results
+
 def main():
     """Main execution function"""
     print("""
@@ -90,14 +103,20 @@ def main():
     api = BingWebmasterAPI(API_KEY)
     
     print(f"Site URL: {SITE_URL}")
-    print(f"Sitemap URL: {SITEMAP_URL}\n")
+    print(f"Sitemap index URL: {SITEMAP_INDEX_URL}\n")
+    
+    # Submit the sitemap index and the shards changed by the last build
+    print("[*] Submitting sitemap index to Bing...")
+    results = submit_sitemap_index(api)
+    result = results[SITEMAP_INDEX_URL]
     
-    # Submit sitemap
-    print("[*] Submitting sitemap to Bing...")
-    result = api.submit_sitemap(SITE_URL, SITEMAP_URL)
+    for feed_url, feed_result in results.items():
+        if feed_url != SITEMAP_INDEX_URL:
+            status = "OK" if feed_result["success"] else f"FAILED: {feed_result.get('error', 'Unknown error')}"
+            print(f"   Changed shard {feed_url}: {status}")
     
     if result["success"]:
-        print("[SUCCESS] Sitemap submitted successfully!")
+        print("[SUCCESS] Sitemap index submitted successfully!")
         print(f"   {result['message']}")
         print("\n[INFO] Bing will now crawl and index all URLs from your sitemap.")
         print("   This may take 24-48 hours to complete.")
@@ -136,8 +155,9 @@ def main():
         json.dump({
             "timestamp": timestamp,
             "site_url": SITE_URL,
-            "sitemap_url": SITEMAP_URL,
+            "sitemap_url": SITEMAP_INDEX_URL,
             "submission_result": result,
+            "shard_results": {url: r for url, r in results.items() if url != SITEMAP_INDEX_URL},
             "sitemaps": sitemaps_result
         }, f, indent=2)
     
@@ -38,7 +38,7 @@ def fetch_sitemap_urls(sitemap_url):
         print(f"[ERROR] Error fetching sitemap: {e}")
         return []
 
-def submit_to_indexnow(urls, host, key):
+def submit_to_indexnow(urls, host, key, session=requests):
     """Submit URLs to IndexNow API"""
     
     # IndexNow accepts max 10,000 URLs per request
@@ -55,7 +55,7 @@ def submit_to_indexnow(urls, host, key):
         }
         
         try:
-            response = requests.post(
+            response = session.post(
                 INDEXNOW_API_URL,
                 json=payload,
                 headers={'Content-Type': 'application/json; charset=utf-8'}
@@ -0,0 +1,286 @@
+"""
+Link Health - Dead Link Checker for Tool URLs
+Check every external tool URL in scraped_tools.json concurrently (HEAD, falling back to GET)
+and keep per-domain results with exponential re-check intervals for failing URLs.
+
+Requires: pip install aiohttp
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+import aiohttp
+
+# Input / output files (same working directory as scrape_aixploria.py)
+INPUT_FILE = "scraped_tools.json"
+CACHE_FILE = "link_health_cache.json"
+
+# Concurrency settings
+CONCURRENCY = 1000  # Requests in flight across all hosts
+PER_HOST_LIMIT = 4  # Connections per host, so one slow site can't hog the pool
+CONNECT_TIMEOUT = 5  # Seconds
+TOTAL_TIMEOUT = 15  # Seconds per request
+
+# Re-check schedule
+HEALTHY_TTL_HOURS = 72  # Re-check healthy URLs after this long
+RETRY_BASE_HOURS = 1  # First re-check of a failing URL; doubles each failure
+RETRY_MAX_HOURS = 24 * 14
+
+# Servers that reject or mishandle HEAD get a GET instead
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 503}
+
+# Final hosts that mean the domain is parked or for sale
+PARKING_HOSTS = ("sedo.com", "afternic.com", "dan.com", "hugedomains.com", "godaddy.com", "parkingcrew.net", "bodis.com")
+
+USER_AGENT = "Mozilla/5.0 (compatible; AllAIToolListLinkChecker/1.0; +https://allaitoollist.com/)"
+
+
+def domain_of(url):
+    """Lowercased hostname without a leading www. ("" for malformed URLs)"""
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        # e.g. "http://[bad" - Invalid IPv6 URL
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def classify(result):
+    """"ok", "redirected", "parked" or "dead" for one check result"""
+    status = result.get("status")
+    if status is None or status >= 400:
+        return "dead"
+    final_domain = domain_of(result.get("final_url") or "")
+    if any(final_domain == host or final_domain.endswith("." + host) for host in PARKING_HOSTS):
+        return "parked"
+    if final_domain and final_domain != domain_of(result["url"]):
+        return "redirected"
+    return "ok"
+
+
+async def fetch_status(session, method, url):
+    """One request; returns (status, final_url)"""
+    async with session.request(method, url, allow_redirects=True) as response:
+        if method == "GET":
+            # Only the status matters; don't pull whole pages through the pool
+            await response.content.read(1024)
+        return response.status, str(response.url)
+
+
+async def check_url(session, semaphore, host_semaphore, url):
+    """HEAD the URL, falling back to GET when HEAD fails or is rejected"""
+    queued = time.monotonic()
+    # Host slot first, so URLs waiting on a busy host don't hold global slots
+    async with host_semaphore, semaphore:
+        # The clock (and aiohttp's timeout) only starts once this URL may use a connection
+        started = time.monotonic()
+        status, final_url, error = None, None, None
+        for method in ("HEAD", "GET"):
+            try:
+                status, final_url = await fetch_status(session, method, url)
+                error = None
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                status, final_url, error = None, None, f"{type(e).__name__}: {e}".strip(": ")
+            if status is not None and status not in HEAD_FALLBACK_STATUSES:
+                break
+
+        return {
+            "url": url,
+            "status": status,
+            "final_url": final_url,
+            "latency_ms": round((time.monotonic() - started) * 1000),
+            "queue_ms": round((started - queued) * 1000),
+            "error": error,
+            "checked_at": datetime.now(timezone.utc).isoformat()
+        }
+
+
+async def check_urls(urls, concurrency=CONCURRENCY, per_host=PER_HOST_LIMIT):
+    """Check many URLs at once over one pooled session"""
+    # Per-host limits are enforced by our own semaphores, before a request starts, so
+    # waiting for a host slot never counts against the request timeout. The connector
+    # itself never makes requests wait for a connection.
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=0, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=TOTAL_TIMEOUT, sock_connect=CONNECT_TIMEOUT)
+    semaphore = asyncio.Semaphore(concurrency)
+    host_semaphores = {}
+    for url in urls:
+        host_semaphores.setdefault(domain_of(url), asyncio.Semaphore(per_host))
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'User-Agent': USER_AGENT}) as session:
+        return await asyncio.gather(*(
+            check_url(session, semaphore, host_semaphores[domain_of(url)], url) for url in urls
+        ))
+
+
+def load_cache(path=CACHE_FILE):
+    """Per-domain results from previous sweeps"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_FILE):
+    """Persist per-domain results"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+
+
+def is_due(entry, url, now):
+    """True if this URL's re-check time has passed or it was never checked"""
+    result = (entry or {}).get("results", {}).get(url)
+    if not result or not result.get("next_check"):
+        return True
+    return datetime.fromisoformat(result["next_check"]) <= now
+
+
+def record_results(cache, results, now):
+    """Merge results into the per-domain cache and schedule each URL's next check"""
+    for result in results:
+        entry = cache.setdefault(domain_of(result["url"]), {"results": {}})
+        previous = entry["results"].get(result["url"], {})
+        result["health"] = classify(result)
+
+        # Back-off is per URL, so one dead page doesn't delay re-checks of healthy ones on the same host
+        if result["health"] in ("dead", "parked"):
+            # Exponential back-off: 1h, 2h, 4h, ... capped at RETRY_MAX_HOURS
+            result["failures"] = previous.get("failures", 0) + 1
+            hours = min(RETRY_BASE_HOURS * 2 ** (result["failures"] - 1), RETRY_MAX_HOURS)
+        else:
+            result["failures"] = 0
+            hours = HEALTHY_TTL_HOURS
+        result["next_check"] = (now + timedelta(hours=hours)).isoformat()
+
+        entry["results"][result["url"]] = result
+        entry["checked_at"] = now.isoformat()
+
+
+def build_report(cache, urls):
+    """Group the current URL list by health using the cached results"""
+    report = {"ok": [], "redirected": [], "parked": [], "dead": [], "unchecked": []}
+    for url in urls:
+        result = cache.get(domain_of(url), {}).get("results", {}).get(url)
+        if result:
+            report[result["health"]].append(result)
+        else:
+            report["unchecked"].append({"url": url})
+    return report
+
+
+def load_tool_urls(path=INPUT_FILE):
+    """Distinct external http(s) URLs from the scraped catalog"""
+    with open(path, 'r', encoding='utf-8') as f:
+        tools = json.load(f)
+    urls = []
+    seen = set()
+    for tool in tools:
+        url = (tool.get("url") or "").strip()
+        # Skip malformed URLs so one bad catalog entry can't abort the sweep
+        if url.startswith(("http://", "https://")) and domain_of(url) and url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def sweep(urls, cache, force=False):
+    """Check every due URL and fold the results into the cache"""
+    now = datetime.now(timezone.utc)
+    due = [url for url in urls if force or is_due(cache.get(domain_of(url)), url, now)]
+    if due:
+        results = asyncio.run(check_urls(due))
+        record_results(cache, results, now)
+    return due
+
+
+async def stub_check(url_count=100, delay=1.0, port=8765):
+    """Check many slow URLs on one local stub host; every one must come back 200"""
+    from aiohttp import web
+
+    async def slow(request):
+        await asyncio.sleep(delay)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_route("*", "/tool/{n}", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    try:
+        results = await check_urls([f"http://127.0.0.1:{port}/tool/{n}" for n in range(url_count)])
+    finally:
+        await runner.cleanup()
+
+    failed = [result for result in results if result["status"] != 200]
+    print(f"[{'FAILED' if failed else 'SUCCESS'}] {url_count - len(failed)}/{url_count} stub URLs returned 200 "
+          f"(max latency {max(r['latency_ms'] for r in results)} ms, max queue {max(r['queue_ms'] for r in results)} ms)")
+    for result in failed[:5]:
+        print(f"    - {result['url']}: {result['error'] or result['status']}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check external tool URLs for dead or parked sites")
+    parser.add_argument("--input", default=INPUT_FILE, help="Scraped tools JSON file")
+    parser.add_argument("--force", action="store_true", help="Ignore re-check schedule and check everything")
+    parser.add_argument("--stub-check", action="store_true",
+                        help="Sanity-check the checker against a local stub server and exit")
+    args = parser.parse_args()
+
+    if args.stub_check:
+        raise SystemExit(0 if asyncio.run(stub_check()) else 1)
+
+    print("""
+============================================================
+     LINK HEALTH - DEAD LINK CHECKER
+============================================================
+    """)
+
+    try:
+        urls = load_tool_urls(args.input)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read {args.input}: {e}")
+        return
+
+    cache = load_cache()
+    print(f"[*] {len(urls)} tool URLs across {len({domain_of(url) for url in urls})} domains")
+
+    started = time.time()
+    try:
+        due = sweep(urls, cache, force=args.force)
+    finally:
+        save_cache(cache)
+    print(f"[INFO] Checked {len(due)} due URLs in {time.time() - started:.1f}s "
+          f"({len(urls) - len(due)} skipped until their next check)")
+
+    report = build_report(cache, urls)
+    print("\n" + "="*60)
+    print("[SUMMARY]")
+    print("="*60)
+    for health in ["ok", "redirected", "parked", "dead", "unchecked"]:
+        print(f"{health.capitalize():<11}: {len(report[health])}")
+    print("="*60)
+
+    for result in (report["dead"] + report["parked"])[:20]:
+        reason = result.get("error") or f"HTTP {result.get('status')} -> {result.get('final_url')}"
+        print(f"    - {result['url']} ({reason})")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_file = f"link_health_{timestamp}.json"
+    with open(results_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "timestamp": timestamp,
+            "summary": {health: len(results) for health, results in report.items()},
+            "report": report
+        }, f, indent=2)
+
+    print(f"\n[SAVED] Results saved to: {results_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""
+Pipeline - Crawl to IndexNow in One Process
+Chains crawl -> normalize -> load -> publish -> notify as in-memory streams.
+
+Usage:
+    python scripts/pipeline.py run [--limit N] [--dry-run] [--no-bing]
+    python scripts/pipeline.py status
+
+Each stage runs in its own thread and hands records to the next one through a
+bounded queue, so a slow stage (e.g. the polite crawler) throttles the ones
+upstream instead of buffering everything. HTTP sessions, the taxonomy resolver
+and API clients are created once and shared. Heavy imports happen inside the
+stages, so `status` starts instantly.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime, timezone
+from functools import cached_property
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))  # scrape_aixploria.py lives in the repo root
+
+# Files (same working directory as scrape_aixploria.py)
+TOOLS_FILE = "scraped_tools.json"
+STATE_FILE = "pipeline_state.json"
+
+# Stream settings
+QUEUE_SIZE = 100  # Records buffered between two stages before the upstream one blocks
+CRAWL_DELAY = 1  # Seconds between tool pages, same as scrape_aixploria.py
+LOAD_BATCH_SIZE = 50  # Rows per Supabase insert, same as seed-tools.ts
+NOTIFY_BATCH_SIZE = 100  # URLs per IndexNow/Bing submission
+MAX_BATCH_WAIT = 60  # Seconds a partial batch may wait for more records
+
+# Files `status` reports on
+STATUS_FILES = {
+    "Scraped tools": TOOLS_FILE,
+    "Related tools": "related_tools.json",
+    "Sitemap manifest": "public/sitemaps/sitemap-manifest.json",
+    "Index status cache": "index_status_cache.json",
+    "Link health cache": "link_health_cache.json"
+}
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+def _pump(stream, out_queue):
+    """Run an upstream stage, blocking whenever the downstream queue is full"""
+    try:
+        for item in stream:
+            out_queue.put(item)
+    except BaseException as e:
+        out_queue.put(_Failure(e))
+    finally:
+        out_queue.put(_DONE)
+
+
+def _drain(in_queue):
+    """Iterate a queue filled by _pump, re-raising upstream errors"""
+    while True:
+        item = in_queue.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def chain(source, *stages, maxsize=QUEUE_SIZE):
+    """Connect generator stages with bounded queues; each upstream stage gets a thread"""
+    stream = source
+    for stage in stages:
+        link = queue.Queue(maxsize=maxsize)
+        threading.Thread(target=_pump, args=(stream, link), daemon=True).start()
+        stream = stage(_drain(link))
+    return stream
+
+
+def batched(stream, size, max_wait=MAX_BATCH_WAIT):
+    """Group a stream into lists of `size`, flushing early once a batch is `max_wait` old"""
+    batch, started = [], None
+    try:
+        for item in stream:
+            if not batch:
+                started = time.monotonic()
+            batch.append(item)
+            if len(batch) >= size or time.monotonic() - started >= max_wait:
+                yield batch
+                batch = []
+    except Exception:
+        # Hand on what already arrived before passing an upstream error along
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+class PipelineContext:
+    """Shared, lazily created resources for one pipeline process"""
+
+    def __init__(self, dry_run=False, use_bing=True):
+        self.dry_run = dry_run
+        self.use_bing = use_bing
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.retry_urls = []  # Published by an earlier run but never notified
+        self.published = []
+        self.notified = set()
+
+    def count(self, stage, n=1):
+        with self.lock:
+            self.stats[stage] = self.stats.get(stage, 0) + n
+
+    @cached_property
+    def session(self):
+        """One pooled HTTP session for the crawler, Supabase and the search engines"""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @cached_property
+    def resolver(self):
+        from taxonomy_resolver import TaxonomyResolver
+        return TaxonomyResolver()
+
+    @cached_property
+    def supabase(self):
+        """(project_url, service_key) for Supabase, or None without credentials"""
+        from sitemap_builder import load_env
+
+        load_env()
+        url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        if not url or not key:
+            return None
+        return url.rstrip('/'), key
+
+    @cached_property
+    def known_tools(self):
+        """Tools already scraped in earlier runs"""
+        try:
+            with open(TOOLS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    @cached_property
+    def known_source_urls(self):
+        return {tool.get("source_url") for tool in self.known_tools}
+
+
+def crawl(ctx, limit=None):
+    """Stage 1: scrape tool pages from the aixploria sitemaps we haven't seen yet"""
+    import scrape_aixploria as scraper
+
+    index = scraper.get_xml_content(scraper.SITEMAP_INDEX_URL, session=ctx.session)
+    if not index:
+        return
+
+    scraped = 0
+    for sitemap_url in scraper.parse_sitemap_index(index):
+        content = scraper.get_xml_content(sitemap_url, session=ctx.session)
+        if not content:
+            continue
+        for tool_url in scraper.parse_sitemap_urls(content):
+            if tool_url in ctx.known_source_urls:
+                continue
+            data = scraper.scrape_tool_page(tool_url, session=ctx.session)
+            ctx.known_source_urls.add(tool_url)
+            if data:
+                ctx.count("crawled")
+                yield data
+                scraped += 1
+                if limit and scraped >= limit:
+                    return
+            time.sleep(CRAWL_DELAY)  # Be polite
+
+
+def normalize(ctx, tools):
+    """Stage 2: map scraped categories/tags onto our taxonomy, as (raw, normalized) pairs"""
+    for tool in tools:
+        ctx.count("normalized")
+        # The raw record travels along so scraped_tools.json stays a raw scrape corpus
+        yield tool, ctx.resolver.normalize_tools([tool])[0]
+
+
+def load(ctx, pairs):
+    """Stage 3: insert new tools into Supabase and append the raw records to scraped_tools.json"""
+    from slug_utils import clean_tool_name, slugify
+
+    if not ctx.dry_run and not ctx.supabase:
+        raise RuntimeError("Missing Supabase credentials (NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY)")
+
+    for batch in batched(pairs, LOAD_BATCH_SIZE):
+        rows = {}
+        for _, tool in batch:
+            name = clean_tool_name(tool.get("name"))
+            slug = slugify(name)
+            if slug and slug not in rows:
+                rows[slug] = {
+                    "name": name,
+                    "slug": slug,
+                    "short_description": tool.get("short_description") or "",
+                    "full_description": tool.get("full_description") or tool.get("short_description") or "",
+                    "url": tool.get("url") or "#",
+                    "category": tool.get("category") or "Other",
+                    "tags": tool.get("tags") or [],
+                    "pricing": tool.get("pricing") or "Unknown",
+                    "platform": ["Web"],
+                    "is_draft": False,
+                    "date_added": datetime.now(timezone.utc).isoformat()
+                }
+
+        if not ctx.dry_run and rows:
+            url, key = ctx.supabase
+            rest_url = f"{url}/rest/v1"
+            headers = {'apikey': key, 'Authorization': f"Bearer {key}"}
+            # Skip slugs that already exist instead of creating "-123" duplicates
+            quoted = ",".join(f'"{slug}"' for slug in rows)
+            response = ctx.session.get(f"{rest_url}/tools", headers=headers,
+                                       params={"select": "slug", "slug": f"in.({quoted})"}, timeout=30)
+            response.raise_for_status()
+            for row in response.json():
+                rows.pop(row["slug"], None)
+
+            if rows:
+                response = ctx.session.post(f"{rest_url}/tools", headers=headers,
+                                            json=list(rows.values()), timeout=30)
+                response.raise_for_status()
+
+            ctx.known_tools.extend(raw for raw, _ in batch)
+            with open(TOOLS_FILE, 'w', encoding='utf-8') as f:
+                json.dump(ctx.known_tools, f, indent=2)
+
+        ctx.count("would load" if ctx.dry_run else "loaded", len(rows))
+        yield from rows.values()
+
+
+def publish(ctx, rows):
+    """Stage 4: turn loaded tools into public URLs, starting with ones a previous run failed to notify"""
+    from bing_config import SITE_URL
+
+    for url in ctx.retry_urls:
+        ctx.published.append(url)
+        yield url
+
+    for row in rows:
+        url = f"{SITE_URL}tool/{row['slug']}"
+        ctx.published.append(url)
+        ctx.count("would publish" if ctx.dry_run else "published")
+        yield url
+
+
+def notify(ctx, urls):
+    """Stage 5: push new URLs to IndexNow (and Bing) in batches"""
+    from bing_config import API_KEY, SITE_URL
+    from indexnow_submit import INDEXNOW_KEY, submit_to_indexnow
+
+    host = SITE_URL.replace("https://", "").replace("http://", "").rstrip("/")
+    bing = None
+    if ctx.use_bing and not ctx.dry_run:
+        from bing_indexing import BingWebmasterAPI
+        bing = BingWebmasterAPI(API_KEY, session=ctx.session)
+
+    for batch in batched(urls, NOTIFY_BATCH_SIZE):
+        if ctx.dry_run:
+            ctx.count("would notify", len(batch))
+            print(f"[DRY RUN] Would notify IndexNow of {len(batch)} URLs")
+            yield {"urls": batch, "result": None}
+            continue
+
+        result = submit_to_indexnow(batch, host, INDEXNOW_KEY, session=ctx.session)
+        if bing:
+            bing_result = bing.submit_url_batch(SITE_URL, batch)
+            if not bing_result["success"]:
+                print(f"[WARN] Bing batch failed: {bing_result.get('error', 'Unknown error')}")
+
+        if result["success"]:
+            ctx.notified.update(batch)
+            ctx.count("notified", len(batch))
+            print(f"[SUCCESS] IndexNow: {result['message']}")
+        else:
+            # Left out of ctx.notified, so the URLs are saved for the next run
+            print(f"[FAILED] IndexNow: {result.get('error', 'Unknown error')}")
+        yield {"urls": batch, "result": result}
+
+
+def refresh_sitemaps(ctx):
+    """Rebuild the sharded sitemaps after new tools were loaded and submit them to Bing; failures are logged, not raised"""
+    from sitemap_builder import SupabaseReader, build_sitemaps
+
+    try:
+        url, key = ctx.supabase
+        result = build_sitemaps(SupabaseReader(url, key, session=ctx.session))
+        print(f"[INFO] Sitemaps refreshed: {len(result['changed'])} changed shards")
+    except Exception as e:
+        print(f"[WARN] Sitemap refresh failed: {e}")
+        return
+
+    if ctx.use_bing:
+        from bing_config import API_KEY, SITE_URL
+        from bing_sitemap_submit import BingWebmasterAPI, submit_sitemap_index
+
+        results = submit_sitemap_index(BingWebmasterAPI(API_KEY, session=ctx.session), SITE_URL)
+        failed = [feed_url for feed_url, result in results.items() if not result["success"]]
+        print(f"[INFO] Submitted {len(results) - len(failed)}/{len(results)} sitemaps to Bing")
+        for feed_url in failed:
+            print(f"[WARN] Sitemap submission failed: {feed_url}: {results[feed_url].get('error', 'Unknown error')}")
+
+
+def load_state():
+    """State saved by the previous run"""
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run(args):
+    """Run every stage end to end"""
+    ctx = PipelineContext(dry_run=args.dry_run, use_bing=not args.no_bing)
+    ctx.retry_urls = load_state().get("pending_urls", [])
+    if ctx.retry_urls:
+        print(f"[INFO] Retrying {len(ctx.retry_urls)} URLs the last run could not notify")
+    started = datetime.now(timezone.utc)
+    error = None
+
+    stream = chain(
+        crawl(ctx, limit=args.limit),
+        lambda s: normalize(ctx, s),
+        lambda s: load(ctx, s),
+        lambda s: publish(ctx, s),
+        lambda s: notify(ctx, s)
+    )
+
+    try:
+        for _ in stream:
+            pass
+    except Exception as e:
+        error = str(e)
+        print(f"[ERROR] Pipeline stopped: {e}")
+
+    # Only after notify has drained, so a sitemap failure can't cost IndexNow notifications
+    if ctx.stats.get("published") and not args.dry_run:
+        refresh_sitemaps(ctx)
+
+    pending = [url for url in dict.fromkeys(ctx.published + ctx.retry_urls) if url not in ctx.notified]
+    state = {
+        "started_at": started.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "dry_run": args.dry_run,
+        "stats": ctx.stats,
+        "error": error,
+        "pending_urls": pending
+    }
+    if not args.dry_run:
+        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+
+    print("\n" + "="*60)
+    print("[SUMMARY]")
+    print("="*60)
+    stages = ["crawled", "normalized", "loaded", "published", "notified"]
+    if args.dry_run:
+        # Nothing was written or submitted - report what a real run would do
+        stages = ["crawled", "normalized", "would load", "would publish", "would notify"]
+    for stage in stages:
+        print(f"{stage.capitalize():<14}: {ctx.stats.get(stage, 0)}")
+    if pending and not args.dry_run:
+        print(f"Pending       : {len(pending)} (retried on the next run)")
+    print(f"Duration      : {(datetime.now(timezone.utc) - started).total_seconds():.0f}s")
+    print("="*60)
+    return 1 if error else 0
+
+
+def status(args):
+    """Show the last run and the state files - local reads only"""
+    state = load_state()
+    if "started_at" in state:
+        print(f"Last run   : {state['started_at']} -> {state.get('finished_at')}")
+        for stage, count in state.get("stats", {}).items():
+            print(f"  {stage:<10}: {count}")
+        if state.get("pending_urls"):
+            print(f"  pending   : {len(state['pending_urls'])} URLs to notify on the next run")
+        if state.get("error"):
+            print(f"  error     : {state['error']}")
+    else:
+        print("Last run   : never")
+
+    print()
+    for label, path in STATUS_FILES.items():
+        if os.path.exists(path):
+            modified = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M")
+            print(f"{label:<19}: {path} (updated {modified})")
+        else:
+            print(f"{label:<19}: missing")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl -> normalize -> load -> publish -> notify pipeline")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subcommands.add_parser("run", help="Run the full pipeline")
+    run_parser.add_argument("--limit", type=int, default=None, help="Stop after this many new tools")
+    run_parser.add_argument("--dry-run", action="store_true", help="Crawl and normalize, but write/submit nothing")
+    run_parser.add_argument("--no-bing", action="store_true", help="Only notify IndexNow")
+    run_parser.set_defaults(handler=run)
+
+    status_parser = subcommands.add_parser("status", help="Show the last run and state files")
+    status_parser.set_defaults(handler=status)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Related Tools - Precomputed TF-IDF Neighbor Table
+Build top-k related tools for every scraped tool so /alternatives/[slug] lookups are a single read
+"""
+
+import re
+import json
+import time
+import numpy as np
+import scipy.sparse as sp
+from slug_utils import clean_tool_name, slugify
+
+# Input / output files (same working directory as scrape_aixploria.py)
+INPUT_FILE = "scraped_tools.json"
+OUTPUT_FILE = "related_tools.json"
+
+# Neighbor settings
+TOP_K = 10  # Related tools kept per tool
+BLOCK_SIZE = 512  # Rows per sparse matrix product (bounds memory at BLOCK_SIZE x tools floats)
+MIN_SCORE = 0.05  # Drop neighbors below this cosine similarity
+
+# Vocabulary pruning
+MIN_DF = 2  # Terms must appear in at least this many tools
+MAX_DF = 0.5  # ...and in at most this fraction of tools
+
+# How much each field counts towards a tool's term weights
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "tags": 2.0,
+    "short_description": 2.0,
+    "full_description": 1.0
+}
+
+STOPWORDS = {
+    "the", "and", "for", "with", "you", "your", "are", "can", "this", "that", "from",
+    "its", "it", "to", "of", "in", "on", "or", "an", "as", "by", "is", "be", "at",
+    "ai", "tool", "tools", "more", "sites", "like", "our", "all", "any", "has", "have",
+    "will", "into", "not", "but", "also", "use", "using"
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords or single characters"""
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def tool_terms(tool):
+    """Weighted term counts across the fields in FIELD_WEIGHTS"""
+    counts = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        value = tool.get(field) or ""
+        if isinstance(value, list):
+            value = " ".join(value)
+        for term in tokenize(value):
+            counts[term] = counts.get(term, 0.0) + weight
+    return counts
+
+
+def build_tfidf_matrix(tools, min_df=MIN_DF, max_df=MAX_DF):
+    """Build an L2-normalized sparse TF-IDF matrix (tools x terms)"""
+    docs = [tool_terms(tool) for tool in tools]
+    n_docs = len(docs)
+
+    # Document frequency, then prune the vocabulary
+    df = {}
+    for doc in docs:
+        for term in doc:
+            df[term] = df.get(term, 0) + 1
+    max_count = max(1, int(max_df * n_docs))
+    vocabulary = {}
+    for term, count in df.items():
+        if min(min_df, n_docs) <= count <= max_count:
+            vocabulary[term] = len(vocabulary)
+
+    rows, cols, values = [], [], []
+    for row, doc in enumerate(docs):
+        for term, count in doc.items():
+            col = vocabulary.get(term)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+                values.append(count)
+
+    matrix = sp.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (np.asarray(rows), np.asarray(cols))),
+        shape=(n_docs, len(vocabulary)),
+        dtype=np.float32
+    )
+
+    # Sublinear tf, smoothed idf
+    matrix.data = 1.0 + np.log(matrix.data)
+    doc_freq = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = (np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0).astype(np.float32)
+    matrix = matrix @ sp.diags(idf)
+
+    # L2 row normalization so dot products are cosine similarities
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = sp.diags(1.0 / norms).astype(np.float32) @ matrix
+
+    return matrix.tocsr(), vocabulary
+
+
+def top_k_neighbors(matrix, k=TOP_K, block_size=BLOCK_SIZE, min_score=MIN_SCORE):
+    """Top-k cosine neighbors per row, computed one block of rows at a time"""
+    n_rows = matrix.shape[0]
+    k = min(k, max(n_rows - 1, 0))
+    neighbors = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float32)
+    if k == 0:
+        return neighbors, scores
+
+    matrix_t = matrix.T.tocsc()
+    for start in range(0, n_rows, block_size):
+        end = min(start + block_size, n_rows)
+        sims = (matrix[start:end] @ matrix_t).toarray()
+
+        # A tool is never its own neighbor
+        sims[np.arange(end - start), np.arange(start, end)] = -1.0
+
+        # Unordered top-k per row, then sort just those k
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        weak = top_scores < min_score
+        top[weak] = -1
+        top_scores[weak] = 0.0
+
+        neighbors[start:end] = top
+        scores[start:end] = top_scores
+
+    return neighbors, scores
+
+
+def build_neighbor_table(tools, neighbors, scores):
+    """Compact {url: {"slug": ..., "related": [[url, slug, score], ...]}} table
+
+    Keyed by the tool's external url (the `url` column in the tools table), since
+    seeded slugs carry a random suffix. `slug` is the base slug from the cleaned name.
+    """
+    keys = [tool.get("url") or tool.get("source_url") or "" for tool in tools]
+    slugs = [slugify(clean_tool_name(tool.get("name"))) for tool in tools]
+    table = {}
+    for row, key in enumerate(keys):
+        if not key or key in table:
+            continue
+        table[key] = {
+            "slug": slugs[row],
+            "related": [
+                [keys[col], slugs[col], round(float(score), 4)]
+                for col, score in zip(neighbors[row], scores[row])
+                if col >= 0 and keys[col] and keys[col] != key
+            ]
+        }
+    return table
+
+
+def main():
+    print("""
+============================================================
+     RELATED TOOLS - TF-IDF NEIGHBOR TABLE
+============================================================
+    """)
+
+    try:
+        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+            tools = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read {INPUT_FILE}: {e}")
+        return
+
+    if not tools:
+        print(f"[ERROR] No tools found in {INPUT_FILE}!")
+        return
+
+    started = time.time()
+
+    print(f"[*] Building TF-IDF matrix for {len(tools)} tools...")
+    matrix, vocabulary = build_tfidf_matrix(tools)
+    print(f"[INFO] {matrix.shape[0]} tools x {len(vocabulary)} terms, {matrix.nnz} non-zeros")
+
+    print(f"[*] Computing top {TOP_K} neighbors in blocks of {BLOCK_SIZE}...")
+    neighbors, scores = top_k_neighbors(matrix)
+    table = build_neighbor_table(tools, neighbors, scores)
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(table, f, separators=(",", ":"))
+
+    print(f"[SUCCESS] Related tools computed for {len(table)} tools in {time.time() - started:.1f}s")
+    print(f"\n[SAVED] Results saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
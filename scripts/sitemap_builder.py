@@ -0,0 +1,275 @@
+"""
+Sitemap Builder - Sharded, Gzipped Sitemaps
+Stream tool/blog/category URLs from Supabase into 50k-URL gzip shards plus a sitemap index.
+Only shards whose contents changed are rewritten.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from datetime import datetime, timezone
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+import requests
+from bing_config import SITE_URL, SITEMAP_INDEX_URL, SITEMAP_DIR
+
+# Sitemap protocol limits
+MAX_URLS_PER_SHARD = 50000
+MAX_SHARD_BYTES = 50 * 1024 * 1024  # Uncompressed
+
+# Rows fetched per Supabase request while streaming
+PAGE_SIZE = 1000
+
+MANIFEST_FILE = "sitemap-manifest.json"
+INDEX_FILE = "sitemap-index.xml"
+
+# Existing sitemaps that stay hand-maintained (static pages)
+EXTRA_SITEMAPS = [f"{SITE_URL}sitemap/pages.xml"]
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+
+
+def load_env(path=".env.local"):
+    """Read KEY=VALUE pairs from .env.local without overriding the real environment"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key, sep, value = line.partition("=")
+            key, value = key.strip(), value.strip()
+            if sep and key and value and not key.startswith("#"):
+                os.environ.setdefault(key, value)
+
+
+class SupabaseReader:
+    def __init__(self, url, key, session=None):
+        self.base_url = f"{url.rstrip('/')}/rest/v1"
+        self.session = session or requests.Session()
+        # Sent per request, so a shared session never leaks the key to other hosts
+        self.headers = {
+            'apikey': key,
+            'Authorization': f"Bearer {key}"
+        }
+
+    def iter_rows(self, table, select, params=None, order="created_at.asc,slug.asc"):
+        """Stream rows page by page in a stable order"""
+        offset = 0
+        while True:
+            query = {"select": select, "order": order, "limit": PAGE_SIZE, "offset": offset}
+            query.update(params or {})
+            response = self.session.get(f"{self.base_url}/{table}", params=query, headers=self.headers, timeout=30)
+            response.raise_for_status()
+            rows = response.json()
+            yield from rows
+            if len(rows) < PAGE_SIZE:
+                return
+            offset += PAGE_SIZE
+
+
+def to_lastmod(value):
+    """Normalize a Supabase timestamp to a W3C datetime in UTC"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def iter_tool_urls(reader, category_lastmod):
+    """Published tools; also records the newest lastmod seen per category"""
+    rows = reader.iter_rows("tools", "slug,category,created_at,updated_at", {"is_draft": "eq.false"})
+    for row in rows:
+        if not row.get("slug"):
+            continue
+        lastmod = to_lastmod(row.get("updated_at") or row.get("created_at"))
+        category = row.get("category")
+        if category and lastmod and lastmod > category_lastmod.get(category, ""):
+            category_lastmod[category] = lastmod
+        yield f"{SITE_URL}tool/{row['slug']}", lastmod
+
+
+def iter_blog_urls(reader):
+    """Published blog posts"""
+    rows = reader.iter_rows("blogs", "slug,created_at,updated_at", {"is_published": "eq.true"})
+    for row in rows:
+        if row.get("slug"):
+            yield f"{SITE_URL}blog/{row['slug']}", to_lastmod(row.get("updated_at") or row.get("created_at"))
+
+
+def iter_category_urls(category_lastmod):
+    """Category pages, dated by their most recently updated tool"""
+    for category in sorted(category_lastmod):
+        yield f"{SITE_URL}category/{quote(category, safe='')}", category_lastmod[category]
+
+
+def render_url(loc, lastmod):
+    """One <url> entry"""
+    entry = f"  <url><loc>{escape(loc)}</loc>"
+    if lastmod:
+        entry += f"<lastmod>{lastmod}</lastmod>"
+    return entry + "</url>\n"
+
+
+class ShardWriter:
+    def __init__(self, output_dir, manifest):
+        self.output_dir = output_dir
+        self.previous = manifest
+        self.shards = {}
+        self.changed = []
+
+    def write_section(self, section, urls):
+        """Split one URL stream into <section>-N.xml.gz shards"""
+        number = 0
+        lines, size, lastmod = [], 0, ""
+
+        for loc, url_lastmod in urls:
+            line = render_url(loc, url_lastmod)
+            if lines and (len(lines) >= MAX_URLS_PER_SHARD or size + len(line) > MAX_SHARD_BYTES):
+                number += 1
+                self._flush(f"{section}-{number}.xml.gz", lines, lastmod)
+                lines, size, lastmod = [], 0, ""
+            lines.append(line)
+            size += len(line)
+            lastmod = max(lastmod, url_lastmod or "")
+
+        if lines:
+            number += 1
+            self._flush(f"{section}-{number}.xml.gz", lines, lastmod)
+
+    def _flush(self, name, lines, lastmod):
+        """Write a shard only if its contents differ from the last build"""
+        body = (XML_HEADER + URLSET_OPEN + "".join(lines) + URLSET_CLOSE).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = os.path.join(self.output_dir, name)
+
+        previous = self.previous.get(name, {})
+        if previous.get("sha256") != digest or not os.path.exists(path):
+            # mtime=0 keeps the gzip bytes deterministic across builds
+            with open(path, 'wb') as raw:
+                with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as f:
+                    f.write(body)
+            self.changed.append(name)
+
+        self.shards[name] = {
+            "sha256": digest,
+            "urls": len(lines),
+            "lastmod": lastmod or previous.get("lastmod") or to_lastmod(datetime.now(timezone.utc).isoformat())
+        }
+
+
+def write_index(output_dir, shards):
+    """Write the sitemap index pointing at every shard plus EXTRA_SITEMAPS"""
+    base = SITEMAP_INDEX_URL.rsplit("/", 1)[0]
+    entries = []
+    for name, shard in shards.items():
+        entries.append(
+            f"  <sitemap><loc>{escape(f'{base}/{name}')}</loc><lastmod>{shard['lastmod']}</lastmod></sitemap>\n"
+        )
+    for url in EXTRA_SITEMAPS:
+        entries.append(f"  <sitemap><loc>{escape(url)}</loc></sitemap>\n")
+
+    with open(os.path.join(output_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        f.write(XML_HEADER)
+        f.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        f.writelines(entries)
+        f.write('</sitemapindex>\n')
+
+
+def load_manifest(output_dir):
+    """Shard hashes from the previous build"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f).get("shards", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def changed_shard_urls(output_dir=SITEMAP_DIR):
+    """Public URLs of the shards rewritten by the last build (for submission scripts)"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            changed = json.load(f).get("changed", [])
+    except (OSError, ValueError):
+        return []
+    base = SITEMAP_INDEX_URL.rsplit("/", 1)[0]
+    return [f"{base}/{name}" for name in changed]
+
+
+def build_sitemaps(reader, output_dir=SITEMAP_DIR):
+    """Stream every section into shards, then refresh the index and manifest"""
+    os.makedirs(output_dir, exist_ok=True)
+    writer = ShardWriter(output_dir, load_manifest(output_dir))
+
+    # Rows stream in created_at order, so new tools only touch the last shard
+    category_lastmod = {}
+    writer.write_section("tools", iter_tool_urls(reader, category_lastmod))
+    writer.write_section("blogs", iter_blog_urls(reader))
+    writer.write_section("categories", iter_category_urls(category_lastmod))
+
+    # Remove shards that no longer exist (e.g. after tools were deleted)
+    removed = [name for name in writer.previous if name not in writer.shards]
+    for name in removed:
+        path = os.path.join(output_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    if writer.changed or removed or not os.path.exists(os.path.join(output_dir, INDEX_FILE)):
+        write_index(output_dir, writer.shards)
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "shards": writer.shards,
+            "changed": writer.changed,
+            "removed": removed
+        }, f, indent=2)
+
+    return {
+        "shards": len(writer.shards),
+        "urls": sum(shard["urls"] for shard in writer.shards.values()),
+        "changed": writer.changed,
+        "removed": removed
+    }
+
+
+def main():
+    print("""
+============================================================
+     SITEMAP BUILDER - SHARDED GZIP SITEMAPS
+============================================================
+    """)
+
+    load_env()
+    supabase_url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
+
+    if not supabase_url or not supabase_key:
+        print("[ERROR] Missing Supabase credentials (NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY)")
+        return
+
+    print(f"Output: {SITEMAP_DIR}")
+    print(f"Index URL: {SITEMAP_INDEX_URL}\n")
+
+    print("[*] Streaming URLs from Supabase...")
+    try:
+        result = build_sitemaps(SupabaseReader(supabase_url, supabase_key))
+    except requests.RequestException as e:
+        print(f"[ERROR] Error fetching rows: {e}")
+        return
+
+    print(f"[SUCCESS] {result['urls']} URLs in {result['shards']} shards")
+    print(f"[INFO] Changed shards: {len(result['changed'])}")
+    for name in result["changed"]:
+        print(f"    - {name}")
+    if result["removed"]:
+        print(f"[INFO] Removed shards: {', '.join(result['removed'])}")
+
+    print(f"\n[SAVED] Index written to: {os.path.join(SITEMAP_DIR, INDEX_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
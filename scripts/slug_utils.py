@@ -0,0 +1,20 @@
+"""
+Slug Utilities
+Python versions of the tool naming/slug rules used by the TypeScript scripts
+"""
+
+import re
+
+
+def clean_tool_name(name):
+    """Remove "Review & Test" junk from AIxploria titles, as seed-tools.ts does"""
+    return (name or "Unnamed Tool")[:255].split(":")[0].strip()
+
+
+def slugify(text):
+    """Same slug rules as scripts/populate-slugs.ts (JS \\w is ASCII-only, hence re.ASCII)"""
+    text = str(text).lower().strip()
+    text = re.sub(r"\s+", "-", text)
+    text = re.sub(r"[^\w\-]+", "", text, flags=re.ASCII)
+    text = re.sub(r"\-\-+", "-", text)
+    return text.strip("-")
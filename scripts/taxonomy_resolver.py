@@ -0,0 +1,252 @@
+"""
+Taxonomy Resolver - Category & Tag Normalization
+Map the raw category/tag labels from scrape_aixploria.py onto our own categories
+"""
+
+import re
+import json
+import difflib
+from collections import Counter
+
+# Input / output files (same working directory as scrape_aixploria.py)
+INPUT_FILE = "scraped_tools.json"
+OUTPUT_FILE = "normalized_tools.json"
+
+# Our categories - keep in sync with `categories` in types/index.ts ("All" is a filter, not a category)
+CATEGORIES = [
+    "Text",
+    "Image",
+    "Video",
+    "Audio",
+    "Code",
+    "Writing",
+    "Productivity",
+    "Automation",
+    "Marketing",
+    "Design",
+    "Business",
+    "Education",
+    "Research",
+    "Data",
+    "SEO",
+    "Social Media",
+    "Customer Support",
+    "Other"
+]
+
+FALLBACK_CATEGORY = "Other"
+
+# Keywords that point a scraped label at one of our categories.
+# The category name itself is always a keyword, so only extra vocabulary goes here.
+CATEGORY_KEYWORDS = {
+    "Text": ["chat", "chatbot", "assistant", "character", "girlfriend", "dating", "relationship", "companion", "chatgpt", "translation"],
+    "Image": ["photo", "picture", "art", "avatar", "face", "deepfake", "swap", "3d", "logo", "fashion"],
+    "Video": ["animation", "movie", "film", "youtube"],
+    "Audio": ["voice", "music", "speech", "podcast", "cloning", "sound"],
+    "Code": ["developer", "github", "programming", "coding", "api"],
+    "Writing": ["writer", "copywriting", "content", "essay", "summarizer", "paraphrase"],
+    "Productivity": ["file", "spreadsheet", "extension", "assistive", "note", "task", "meeting"],
+    "Automation": ["agent", "workflow", "bot", "nocode"],
+    "Marketing": ["email", "mail", "newsletter", "advertising", "ads", "commerce", "ecommerce"],
+    "Design": ["editing", "editor", "mockup", "ui", "ux", "interior"],
+    "Business": ["finance", "sales", "legal", "hr", "human", "resource", "startup"],
+    "Education": ["study", "learning", "course", "student", "teacher"],
+    "Research": ["detection", "simulation", "science", "health", "healthcare", "medical"],
+    "Data": ["analytics", "database", "sql", "dashboard"],
+    "SEO": ["search", "ranking", "keyword"],
+    "Social Media": ["social", "instagram", "tiktok", "twitter", "linkedin"],
+    "Customer Support": ["customer", "support", "helpdesk"],
+    "Other": ["game", "games"]
+}
+
+# Tokens that carry no category signal ("Latest AI", "AI Useful", "Future Tools", ...)
+STOPWORDS = {
+    "ai", "and", "the", "to", "of", "for", "a", "an", "with", "by",
+    "tool", "latest", "selection", "useful", "future", "amazing", "rip", "new",
+    "all", "list", "allaitoollist", "uncategorized", "at"
+}
+
+# Naming a category outright counts more than one of its keywords ("Image editing" -> Image)
+NAME_WEIGHT = 2.0
+
+# Minimum difflib ratio for a fuzzy token match (e.g. "chatbott" -> "chatbot")
+FUZZY_CUTOFF = 0.85
+
+
+def format_category_name(name):
+    """Replace legacy competitor branding (mirrors formatCategoryName in lib/category-utils.ts)"""
+    return re.sub(r"aixploria", "All AI Tool List", name, flags=re.IGNORECASE)
+
+
+def clean_label(label):
+    """Rebrand and collapse whitespace in a raw label, keeping its display form"""
+    return re.sub(r"\s+", " ", format_category_name(label or "")).strip()
+
+
+def stem_token(token):
+    """Cheap plural folding so "generators"/"studies" match "generator"/"study" """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(label):
+    """Split a label into normalized, stemmed, stopword-free tokens"""
+    tokens = []
+    for raw in re.split(r"[^a-z0-9]+", label.lower()):
+        if not raw:
+            continue
+        token = stem_token(raw)
+        if token not in STOPWORDS and raw not in STOPWORDS:
+            tokens.append(token)
+    return tuple(tokens)
+
+
+class TaxonomyResolver:
+    def __init__(self, categories=CATEGORIES, keywords=CATEGORY_KEYWORDS,
+                 fallback=FALLBACK_CATEGORY, fuzzy_cutoff=FUZZY_CUTOFF):
+        self.categories = list(categories)
+        self.fallback = fallback
+        self.fuzzy_cutoff = fuzzy_cutoff
+
+        # Inverted index: vocabulary token -> {category: weight}.
+        # A token shared by several categories splits its vote between them.
+        owners = {}
+        for category in self.categories:
+            vocabulary = {token: 1.0 for keyword in keywords.get(category, []) for token in tokenize(keyword)}
+            vocabulary.update({token: NAME_WEIGHT for token in tokenize(category)})
+            for token, weight in vocabulary.items():
+                owners.setdefault(token, {})[category] = weight
+
+        self.index = {
+            token: {category: weight / len(cats) for category, weight in cats.items()}
+            for token, cats in owners.items()
+        }
+        self.vocabulary = sorted(self.index)
+        self._rank = {category: i for i, category in enumerate(self.categories)}
+
+        # Memoized decisions: normalized token -> vocabulary token, token tuple -> category
+        self._token_cache = {}
+        self._label_cache = {}
+
+    def match_token(self, token):
+        """Map a label token onto the vocabulary, exactly or by fuzzy match"""
+        if token in self._token_cache:
+            return self._token_cache[token]
+
+        if token in self.index:
+            match = token
+        else:
+            close = difflib.get_close_matches(token, self.vocabulary, n=1, cutoff=self.fuzzy_cutoff)
+            match = close[0] if close else None
+
+        self._token_cache[token] = match
+        return match
+
+    def _score(self, tokens):
+        """Pick the category with the most keyword votes, or None"""
+        scores = Counter()
+        last_seen = {}
+        for position, token in enumerate(tokens):
+            match = self.match_token(token)
+            if match:
+                scores.update(self.index[match])
+                last_seen.update(dict.fromkeys(self.index[match], position))
+
+        if not scores:
+            return None
+
+        # Highest score wins; ties go to the later token ("Text-to-video" -> Video),
+        # then to the category listed first
+        return min(scores, key=lambda category: (-scores[category], -last_seen[category], self._rank[category]))
+
+    def resolve(self, label):
+        """Resolve one raw label to one of our categories, or None if it carries no signal"""
+        tokens = tokenize(clean_label(label))
+        if tokens not in self._label_cache:
+            self._label_cache[tokens] = self._score(tokens)
+        return self._label_cache[tokens]
+
+    def resolve_batch(self, labels):
+        """Resolve many labels at once - each distinct label is only scored once"""
+        decisions = {}
+        for label in labels:
+            if label not in decisions:
+                decisions[label] = self.resolve(label)
+        return [decisions[label] for label in labels]
+
+    def normalize_tags(self, tags):
+        """Clean tag display forms and drop case-insensitive duplicates"""
+        seen = set()
+        cleaned = []
+        for tag in tags or []:
+            tag = clean_label(tag)
+            key = tag.lower()
+            if tag and key not in seen:
+                seen.add(key)
+                cleaned.append(tag)
+        return cleaned
+
+    def normalize_tools(self, tools):
+        """Normalize category and tags for a whole list of scraped tools"""
+        # Resolve every distinct label in the batch up front
+        labels = set()
+        for tool in tools:
+            labels.add(tool.get("category") or "")
+            labels.update(self.normalize_tags(tool.get("tags")))
+        decisions = dict(zip(labels, self.resolve_batch(list(labels))))
+
+        normalized = []
+        for tool in tools:
+            source_category = tool.get("category") or ""
+            tags = self.normalize_tags(tool.get("tags"))
+
+            category = decisions[source_category]
+            if category is None:
+                # Generic source category ("Latest AI", "Uncategorized") - let the tags vote
+                votes = Counter(decisions[tag] for tag in tags if decisions[tag])
+                category = votes.most_common(1)[0][0] if votes else self.fallback
+
+            normalized.append({
+                **tool,
+                "category": category,
+                "tags": tags,
+                "source_category": clean_label(source_category)
+            })
+
+        return normalized
+
+
+def main():
+    print("""
+============================================================
+     TAXONOMY RESOLVER - CATEGORY & TAG NORMALIZATION
+============================================================
+    """)
+
+    try:
+        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+            tools = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read {INPUT_FILE}: {e}")
+        return
+
+    print(f"[*] Normalizing {len(tools)} tools from {INPUT_FILE}...")
+    resolver = TaxonomyResolver()
+    normalized = resolver.normalize_tools(tools)
+
+    counts = Counter(tool["category"] for tool in normalized)
+    print(f"[SUCCESS] Resolved {len(resolver._label_cache)} distinct labels into {len(counts)} categories:")
+    for category, count in counts.most_common():
+        print(f"    - {category}: {count}")
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(normalized, f, indent=2)
+
+    print(f"\n[SAVED] Results saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()